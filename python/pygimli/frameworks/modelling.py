@@ -59,6 +59,11 @@ class Modelling(pg.ModellingBase):
         if trans is not None:
             self.__regionProperties[region]['trans'] = trans
 
+    def regionProperties(self):
+        """Return a copy of all properties set by setRegionProperties."""
+        return {rID: dict(vals)
+                for rID, vals in self.__regionProperties.items()}
+
     def _applyRegionProperties(self):
         """
         """
@@ -108,6 +113,17 @@ class Block1DModelling(Modelling):
         self.__withMultiThread = True
         self.__nBlocks = nBlocks
 
+    @property
+    def withMultiThread(self):
+        """Calculate the jacobian in several processes."""
+        return self.__withMultiThread
+
+    @withMultiThread.setter
+    def withMultiThread(self, w):
+        self.__withMultiThread = w
+        if not w:
+            self.setMultiThreadJacobian(1)
+
     def setLayers(self, nLayers):
 
         if nLayers < 2:
@@ -4,7 +4,7 @@
 
 # TODO Please sort the content into SIP package!
 
-import pylab as P
+import matplotlib.pyplot as plt
 import numpy as N
 
 import pygimli as pg
@@ -13,21 +13,21 @@ from pygimli.utils import rndig
 
 def astausgleich(ab2org, mn2org, rhoaorg):
     """shifts the branches of a dc sounding to generate a matching curve."""
-    ab2 = P.asarray(ab2org)
-    mn2 = P.asarray(mn2org)
-    rhoa = P.asarray(rhoaorg)
-    um = P.unique(mn2)
+    ab2 = N.asarray(ab2org)
+    mn2 = N.asarray(mn2org)
+    rhoa = N.asarray(rhoaorg)
+    um = N.unique(mn2)
     for i in range(len(um) - 1):
         r0, r1 = [], []
-        ac = P.intersect1d(ab2[mn2 == um[i]], ab2[mn2 == um[i + 1]])
+        ac = N.intersect1d(ab2[mn2 == um[i]], ab2[mn2 == um[i + 1]])
         for a in ac:
             r0.append(rhoa[(ab2 == a) * (mn2 == um[i])][0])
             r1.append(rhoa[(ab2 == a) * (mn2 == um[i + 1])][0])
 
         if len(r0) > 0:
-            fak = P.mean(P.array(r0) / P.array(r1))
+            fak = N.mean(N.array(r0) / N.array(r1))
             print(fak)
-            if P.isfinite(fak) and fak > 0.:
+            if N.isfinite(fak) and fak > 0.:
                 rhoa[mn2 == um[i + 1]] *= fak
 
     return rhoa  # formerly pg as vector
@@ -109,36 +109,34 @@ def showsounding(ab2, rhoa, resp=None, mn2=None, islog=True, xlab=None):
     rhoa = N.asarray(rhoa)
     if mn2 is None:
         if islog:
-            l1 = P.loglog(rhoa, ab2, 'rx-', label='observed')
+            l1 = plt.loglog(rhoa, ab2, 'rx-', label='observed')
         else:
-            l1 = P.semilogy(rhoa, ab2, 'rx-', label='observed')
+            l1 = plt.semilogy(rhoa, ab2, 'rx-', label='observed')
 
-        P.hold(True)
         if resp is not None:
             if islog:
-                l2 = P.loglog(resp, ab2, 'bo-', label='simulated')
+                l2 = plt.loglog(resp, ab2, 'bo-', label='simulated')
             else:
-                l2 = P.semilogy(resp, ab2, 'bo-', label='simulated')
+                l2 = plt.semilogy(resp, ab2, 'bo-', label='simulated')
 
-            P.legend((l1, l2), ('obs', 'sim'), loc=0)
+            plt.legend((l1, l2), ('obs', 'sim'), loc=0)
     else:
         for unmi in N.unique(mn2):
             if islog:
-                l1 = P.loglog(rhoa[mn2 == unmi], ab2a[mn2 == unmi],
-                              'rx-', label='observed')
-            else:
-                l1 = P.semilogy(rhoa[mn2 == unmi], ab2a[mn2 == unmi],
+                l1 = plt.loglog(rhoa[mn2 == unmi], ab2a[mn2 == unmi],
                                 'rx-', label='observed')
+            else:
+                l1 = plt.semilogy(rhoa[mn2 == unmi], ab2a[mn2 == unmi],
+                                  'rx-', label='observed')
 
-            P.hold(True)
             if resp is not None:
-                l2 = P.loglog(resp[mn2 == unmi], ab2a[mn2 == unmi],
-                              'bo-', label='simulated')
-                P.legend((l1, l2), ('obs', 'sim'))
+                l2 = plt.loglog(resp[mn2 == unmi], ab2a[mn2 == unmi],
+                                'bo-', label='simulated')
+                plt.legend((l1, l2), ('obs', 'sim'))
 
-    P.axis('tight')
-    P.ylim((max(ab2), min(ab2)))
-    locs = P.yticks()[0]
+    plt.axis('tight')
+    plt.ylim((max(ab2), min(ab2)))
+    locs = plt.yticks()[0]
     if len(locs) < 2:
         locs = N.hstack((min(ab2), locs, max(ab2)))
     else:
@@ -149,50 +147,50 @@ def showsounding(ab2, rhoa, resp=None, mn2=None, islog=True, xlab=None):
     for l in locs:
         a.append('%g' % rndig(l))
 
-    P.yticks(locs, a)
+    plt.yticks(locs, a)
 
-    locs = P.xticks()[0]
+    locs = plt.xticks()[0]
 
     a = []
     for l in locs:
         a.append('%g' % rndig(l))
 
-    P.xticks(locs, a)
+    plt.xticks(locs, a)
 
-    P.grid(which='both')
-    P.xlabel(xlab)
-    P.ylabel('AB/2 in m')
-    # P.legend()
-    P.show()
+    plt.grid(which='both')
+    plt.xlabel(xlab)
+    plt.ylabel('AB/2 in m')
+    # plt.legend()
+    plt.show()
     return
 
 
 def showsip1ddata(PHI, fr, ab2, mn2=None, cmax=None, ylab=True, cbar=True):
     """display SIP phase data as image plot."""
-    P.cla()
-    ax = P.gca()
-    pal = P.cm.get_cmap()
+    plt.cla()
+    ax = plt.gca()
+    pal = plt.cm.get_cmap()
     pal.set_under('w')
     pal.set_bad('w')
     if isinstance(PHI, pg.RVector):
         PHI = N.asarray(PHI)
 
-    im = P.imshow(PHI.reshape((len(ab2), len(fr))),
-                  interpolation='nearest', cmap=pal)
+    im = plt.imshow(PHI.reshape((len(ab2), len(fr))),
+                    interpolation='nearest', cmap=pal)
     if cmax is None:
         cmax = N.max(PHI)
 
     im.set_clim((0., cmax))
 
     ax.xaxis.set_label_position('top')
-    P.xlabel('f in Hz')
+    plt.xlabel('f in Hz')
 
     a = []
     df = 1
     for f in fr[::df]:
         a.append("%g" % rndig(f))
 
-    P.xticks(N.arange(0, len(fr), df), a)
+    plt.xticks(N.arange(0, len(fr), df), a)
     xtl = ax.get_xticklabels()
     for i, xtli in enumerate(xtl):
         xtli.set_rotation('vertical')
@@ -208,15 +206,15 @@ def showsip1ddata(PHI, fr, ab2, mn2=None, cmax=None, ylab=True, cbar=True):
             for i in range(len(ab2)):
                 a.append('%g%g' % (rndig(ab2[i]), rndig(mn2[i])))
 
-        P.yticks(N.arange(len(ab2)), a)
-        P.ylabel(yla + ' in m')
+        plt.yticks(N.arange(len(ab2)), a)
+        plt.ylabel(yla + ' in m')
 
     if cbar:
-        P.colorbar(aspect=40, shrink=0.6)
+        plt.colorbar(aspect=40, shrink=0.6)
 
-    P.ylim((len(ab2) - 0.5, -0.5))
-    P.show()
-    P.ylim((len(ab2) - 0.5, -0.5))
+    plt.ylim((len(ab2) - 0.5, -0.5))
+    plt.show()
+    plt.ylim((len(ab2) - 0.5, -0.5))
     return
 
 
@@ -228,8 +226,8 @@ def showsip1dmodel(M, tau, thk, res=None, z=None,
     if z is None:
         z = N.cumsum(N.hstack((0., thk)))
 
-    P.cla()
-    pal = P.cm.get_cmap()
+    plt.cla()
+    pal = plt.cm.get_cmap()
     pal.set_under('w')
     pal.set_bad('w')
     if isinstance(M, pg.RVector):
@@ -239,7 +237,7 @@ def showsip1dmodel(M, tau, thk, res=None, z=None,
         M = N.log10(M)
 
     M = M.reshape((len(z), len(tau)))
-    im = P.imshow(M, interpolation='nearest', cmap=pal)
+    im = plt.imshow(M, interpolation='nearest', cmap=pal)
     if cmax is None:
         cmax = N.max(M)
 
@@ -252,22 +250,22 @@ def showsip1dmodel(M, tau, thk, res=None, z=None,
     for t in tau[::2]:
         a.append("%g" % rndig(t * 1000, 2))
 
-    P.xticks(N.arange(0, len(tau), 2), a)
+    plt.xticks(N.arange(0, len(tau), 2), a)
 
     a = []
     for zi in z:
         a.append(str(zi))
 
-    P.yticks(N.arange(len(z)) - 0.5, a)
-    P.xlabel(r'$\tau$ in ms')
-    P.ylabel('z in m')
-    P.ylim((len(z) - 0.5, -0.5))
-    P.colorbar(orientation='horizontal', aspect=40, shrink=0.6)
+    plt.yticks(N.arange(len(z)) - 0.5, a)
+    plt.xlabel(r'$\tau$ in ms')
+    plt.ylabel('z in m')
+    plt.ylim((len(z) - 0.5, -0.5))
+    plt.colorbar(orientation='horizontal', aspect=40, shrink=0.6)
 
     if res is not None:
-        xl = P.xlim()[1]
+        xl = plt.xlim()[1]
         for i in range(len(res)):
-            P.text(xl, i, r' %g $\Omega$m' % rndig(res[i], 2))
+            plt.text(xl, i, r' %g $\Omega$m' % rndig(res[i], 2))
 
     lgm = N.zeros((len(z), 1))
     tch = N.zeros((len(z), 1))
@@ -281,10 +279,10 @@ def showsip1dmodel(M, tau, thk, res=None, z=None,
         lgm[n] = N.exp(N.sum(m * lgt) / N.sum(m))
 
     tpos = N.interp(N.log(lgm), N.log(tau), N.arange(len(tau)))
-    P.plot(tpos, N.arange(len(z)), 'w*')
+    plt.plot(tpos, N.arange(len(z)), 'w*')
 
-    P.title('logarithmized spectral chargeability')
-    P.show()
+    plt.title('logarithmized spectral chargeability')
+    plt.show()
     return lgm, tch
 
 
@@ -312,7 +310,7 @@ class DebyeModelling(pg.ModellingBase):
         """phase spectrum as function of spectral chargeabilities."""
         y = pg.RVector(len(self.f_), 0.0)
         for (t, p) in zip(self.t_, par):
-            wt = self.f_ * 2.0 * P.pi * t
+            wt = self.f_ * 2.0 * N.pi * t
             y = y + wt / (wt * wt + 1.) * p
 
         return y
@@ -385,8 +383,8 @@ class DoubleColeColeModelling(pg.ModellingBase):
     def response(self, par):
         """yields phase response response of double Cole Cole model."""
         y = pg.RVector(self.f_.size(), 0.0)
-        wti = self.f_ * par[1] * 2.0 * P.pi
-        wte = self.f_ * par[4] * 2.0 * P.pi
+        wti = self.f_ * par[1] * 2.0 * N.pi
+        wte = self.f_ * par[4] * 2.0 * N.pi
         for i in range(0, y.size()):
             cpI = 1. / (N.power(wti[i] * 1j, par[2]) + 1.)
             cpE = 1. / (N.power(wte[i] * 1j, par[5]) + 1.)
@@ -432,10 +430,10 @@ def ReadAndRemoveEM(filename, readsecond=False, doplot=False,
             " c =" + str(rndig(erg[2]))
         s += "  EM: m= " + str(rndig(erg[3])) + " t=" + str(rndig(erg[4])) + \
             " c =" + str(rndig(erg[5]))
-        fig = P.figure(1)
+        fig = plt.figure(1)
         fig.clf()
-        ax = P.subplot(111)
-        P.errorbar(
+        ax = plt.subplot(111)
+        plt.errorbar(
             fr,
             phi *
             1000.,
@@ -444,16 +442,16 @@ def ReadAndRemoveEM(filename, readsecond=False, doplot=False,
             fmt='x-',
             label='measured')
         ax.set_xscale('log')
-        P.semilogx(fr, emphi * 1000., label='EM term (CC)')
-        P.errorbar(fr, resid, yerr=dphi * 1000., label='IP term')
+        plt.semilogx(fr, emphi * 1000., label='EM term (CC)')
+        plt.errorbar(fr, resid, yerr=dphi * 1000., label='IP term')
         ax.set_yscale('log')
-        P.xlim((min(fr), max(fr)))
-        P.ylim((0.1, max(phi) * 1000.))
-        P.xlabel('f in Hz')
-        P.ylabel(r'-$\phi$ in mrad')
-        P.grid(True)
-        P.title(s)
-        P.legend(loc=2)  # ('measured','2-cole-cole','residual'))
+        plt.xlim((min(fr), max(fr)))
+        plt.ylim((0.1, max(phi) * 1000.))
+        plt.xlabel('f in Hz')
+        plt.ylabel(r'-$\phi$ in mrad')
+        plt.grid(True)
+        plt.title(s)
+        plt.legend(loc=2)  # ('measured','2-cole-cole','residual'))
         fig.show()
 
     return N.array(fr), N.array(rhoa), N.array(resid), N.array(
@@ -8,4 +8,5 @@
 """
 
 from .ert import ERTManager, ERTModelling, createERTData
-from .ves import VESModelling, VESCModelling, VESManager
+from .ves import (VESModelling, VESCModelling, VESStitchedModelling,
+                  VESManager, vesAB2)
@@ -2,17 +2,87 @@
 """
 Vertical electrical sounding (VES) manager class.
 """
+from collections import OrderedDict
+
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
 import pygimli as pg
-from pygimli.mplviewer import drawModel1D
 
 from pygimli.frameworks import Modelling, Block1DModelling
 
 from pygimli.manager import MethodManager1d
 
 
+def _geometricFactorNumpy(am, an, bm, bn):
+    """Geometric factor for arbitrary four-point arrays."""
+    denom = np.reciprocal(am) - np.reciprocal(an)
+    denom -= np.reciprocal(bm)
+    denom += np.reciprocal(bn)
+    return (2.0 * np.pi) / denom
+
+
+def _geometricFactorLoop(am, an, bm, bn):
+    """Geometric factor for arbitrary four-point arrays (numba kernel)."""
+    k = np.empty_like(am)
+    for i in range(am.size):
+        k[i] = (2.0 * np.pi) / (1.0/am[i] - 1.0/an[i] -
+                                1.0/bm[i] + 1.0/bn[i])
+    return k
+
+
+_geometricFactorKernel = None
+
+
+def _geometricFactor(am, an, bm, bn):
+    """Geometric factor for arbitrary four-point arrays.
+
+    Uses a numba kernel if numba is installed and numpy otherwise. numba is
+    imported on first use so importing this module stays cheap.
+    """
+    global _geometricFactorKernel
+    if _geometricFactorKernel is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _geometricFactorKernel = _geometricFactorNumpy
+        else:
+            # fastmath without 'nnan'/'ninf' so singular geometries stay
+            # detectable
+            _geometricFactorKernel = njit(
+                cache=True,
+                fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})(
+                    _geometricFactorLoop)
+
+    return _geometricFactorKernel(am, an, bm, bn)
+
+
+def _startThicknesses(nLayer):
+    """Default start thicknesses 2, 4, 8, ... m for nLayer layers."""
+    return 2.0 ** (1.0 + np.arange(nLayer - 1, dtype=np.float64))
+
+
+def vesAB2(start=1.5, stop=100., n=32):
+    """Logarithmically equidistant AB/2 distances for a sounding.
+
+    Parameters
+    ----------
+    start : float [1.5]
+        Smallest AB/2 in m.
+
+    stop : float [100.]
+        Largest AB/2 in m.
+
+    n : int [32]
+        Number of distances.
+
+    Returns
+    -------
+    ab2 : np.array
+    """
+    return np.geomspace(start, stop, n)
+
+
 class VESModelling(Block1DModelling):
     """Vertical Electrical Sounding (VES) forward operator.
 
@@ -41,17 +111,27 @@ class VESModelling(Block1DModelling):
         self.an = None
         self.bn = None
         self.ab2 = None
+        self.k = None
+        # (max, min) of ab2 for inverted y limits in drawData
+        self._ab2Lim = None
+
+        # last (ab2, mn2) pair to skip recalculation for unchanged geometry
+        self._dataBasisSig = None
+        # core forward operators per layer count for the current data basis
+        self._fopCache = {}
+        # least recently used responses for the current data basis
+        self._respCache = OrderedDict()
+        self._respCacheSize = 128
 
         super(VESModelling, self).__init__(**kwargs)
 
         self.setDataBasis(ab2=ab2, mn2=mn2)
 
     def createStartModel(self, rhoa, nLayer):
-        self.setLayers(nLayer)
+        if self.regionManager().parameterCount() != 2 * nLayer - 1:
+            self.setLayers(nLayer)
 
-        startThicks = np.zeros(nLayer-1)
-        for i in range(nLayer-1):
-            startThicks[i] = pow(2.0, 1.0 + i)
+        startThicks = _startThicknesses(nLayer)
 
         # layer thickness properties
         self.setRegionProperties(0, startModel=startThicks, trans='log')
@@ -77,49 +157,113 @@ class VESModelling(Block1DModelling):
         an = kwargs.pop('an', None)
         bn = kwargs.pop('bn', None)
 
+        sig = None
         if ab2 is not None and mn2 is not None:
 
-            if isinstance(mn2, float):
-                mn2 = np.ones(len(ab2))*mn2
+            if self._dataBasisSig is not None and \
+                np.array_equal(ab2, self._dataBasisSig[0]) and \
+                np.array_equal(mn2, self._dataBasisSig[1]):
+                # same geometry as before .. nothing to do
+                return
+
+            sig = (np.array(ab2), np.array(mn2))
 
-            if len(ab2) != len(mn2):
+            ab2 = np.asarray(ab2, dtype=np.float64)
+            try:
+                mn2 = np.broadcast_to(np.asarray(mn2, dtype=np.float64),
+                                      ab2.shape)
+            except ValueError:
                 print("ab2", ab2)
                 print("mn2", mn2)
                 raise Exception("length of ab2 is unequal length of nm2")
 
-            self.am = ab2 - mn2
-            self.an = ab2 + mn2
-            self.bm = ab2 + mn2
-            self.bn = ab2 - mn2
+            am = ab2 - mn2
+            an = ab2 + mn2
+            bm = ab2 + mn2
+            bn = ab2 - mn2
 
         elif am is not None \
             and bm is not None \
             and an is not None \
             and bn is not None:
-            self.am = am
-            self.bm = bm
-            self.an = an
-            self.bn = bn
-
-        if self.am is not None and self.bm is not None:
-            self.ab2 = (self.am + self.bm) / 2
-
-            self.k = (2.0 * np.pi) / (1.0/self.am - 1.0/self.an -
-                                    1.0/self.bm + 1.0/self.bn)
+            # the core is double precision only, so hand over contiguous
+            # float64 arrays that convert without an additional copy
+            am = np.ascontiguousarray(am, dtype=np.float64)
+            bm = np.ascontiguousarray(bm, dtype=np.float64)
+            an = np.ascontiguousarray(an, dtype=np.float64)
+            bn = np.ascontiguousarray(bn, dtype=np.float64)
+        else:
+            return
+
+        # coinciding electrodes give 1/0 = inf and a finite but useless k = 0
+        if np.any(am <= 0) or np.any(an <= 0) or \
+            np.any(bm <= 0) or np.any(bn <= 0):
+            raise Exception("Invalid data basis: electrode distances "
+                            "need to be positive.")
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = _geometricFactor(am, an, bm, bn)
+
+        # fail early instead of propagating inf/nan into k
+        if not np.all(np.isfinite(k)) or np.any(k == 0):
+            raise Exception("Invalid data basis: electrode distances "
+                            "lead to a singular geometric factor.")
+
+        # apply the geometry only after it has been validated
+        self.am = am
+        self.an = an
+        self.bm = bm
+        self.bn = bn
+        self.k = k
+
+        self.ab2 = (self.am + self.bm) / 2
+        self._ab2Lim = (float(self.ab2.max()), float(self.ab2.min()))
+        self._fopCache = {}
+        self._respCache.clear()
+        self._dataBasisSig = sig
 
     def response(self, par):
         return self.response_mt(par, 0)
 
     def response_mt(self, par, i=0):
+        nLayer = (len(par)+1) // 2
+        return self._cachedResponse(self._coreFop(nLayer), par)
 
-        if self.am is not None and self.bm is not None:
-            nLayer = (len(par)+1) // 2
-            fop = pg.DC1dModelling(nLayer, self.am, self.bm, self.an, self.bn)
-        else:
+    def _createCoreFop(self, nLayer):
+        """Create the core forward operator for the current data basis."""
+        return pg.DC1dModelling(nLayer, self.am, self.bm, self.an, self.bn)
+
+    def _coreFop(self, nLayer):
+        """Return the cached core forward operator for nLayer layers."""
+        if self.am is None or self.bm is None:
             raise Exception("I have no data basis .. "
                             "don't know what to calculate.")
 
-        return fop.response(par)
+        fop = self._fopCache.get(nLayer)
+        if fop is None:
+            fop = self._createCoreFop(nLayer)
+            self._fopCache[nLayer] = fop
+        return fop
+
+    def _cachedResponse(self, fop, par):
+        """Return fop.response(par) from or into a bounded LRU cache.
+
+        Inversion line searches and repeated runs on the same data
+        revisit identical models quite often.
+        """
+        key = np.asarray(par, dtype=np.float64).tobytes()
+
+        resp = self._respCache.get(key)
+        if resp is None:
+            resp = fop.response(par)
+            self._respCache[key] = resp
+            if len(self._respCache) > self._respCacheSize:
+                self._respCache.popitem(last=False)
+        else:
+            self._respCache.move_to_end(key)
+
+        # callers may change the response in place
+        return pg.RVector(resp)
 
     def drawModel(self, ax, model):
         pg.mplviewer.drawModel1D(ax=ax,
@@ -127,6 +271,20 @@ class VESModelling(Block1DModelling):
                                  plot='loglog',
                                  xlabel='Resistivity [$\Omega$m]')
 
+    def _drawErrorBars(self, ax, vals, relErr):
+        """Draw horizontal error bars as one line collection.
+
+        Much faster than ax.errorbar for many data since matplotlib only
+        creates one artist instead of one per bar.
+        """
+        vals = np.asarray(vals)
+        dVals = vals * relErr
+        segs = np.stack([np.column_stack([vals - dVals, self.ab2]),
+                         np.column_stack([vals + dVals, self.ab2])], axis=1)
+        ax.add_collection(LineCollection(segs, colors='red', linewidths=2,
+                                         zorder=3))
+        ax.autoscale_view()
+
     def drawData(self, ax, data, err=None, label=None, **kwargs):
         """
         """
@@ -140,11 +298,9 @@ class VESModelling(Block1DModelling):
         ax.loglog(ra, self.ab2, 'x-', color=col)
 
         if err is not None:
-            ax.errorbar(ra, self.ab2,
-                        xerr=ra * raE, elinewidth=2, barsabove=True,
-                        linewidth=0, color='red')
+            self._drawErrorBars(ax, ra, raE)
 
-        ax.set_ylim(max(self.ab2), min(self.ab2))
+        ax.set_ylim(*self._ab2Lim)
         ax.set_xlabel('Apparent resistivity [$\Omega$m]')
         ax.set_ylabel('AB/2 in [m]')
         ax.grid(True)
@@ -155,11 +311,10 @@ class VESCModelling(VESModelling):
         super(VESCModelling, self).__init__(nBlocks=2, **kwargs)
 
     def createStartModel(self, rhoa, nLayer):
-        self.setLayers(nLayer)
+        if self.regionManager().parameterCount() != 3 * nLayer - 1:
+            self.setLayers(nLayer)
 
-        startThicks = np.zeros(nLayer-1)
-        for i in range(nLayer-1):
-            startThicks[i] = pow(2.0, 1.0 + i)
+        startThicks = _startThicknesses(nLayer)
 
         # layer thickness properties
         self.setRegionProperties(0, startModel=startThicks, trans='log')
@@ -175,14 +330,12 @@ class VESCModelling(VESModelling):
         return sm
 
     def response_mt(self, par, i=0):
-        if self.am is not None and self.bm is not None:
-            nLayer = (len(par) + 1) // 3
-            fop = pg.DC1dModellingC(nLayer, self.am, self.bm, self.an, self.bn)
-        else:
-            raise Exception("I have no data basis .. "
-                            "don't know what to calculate.")
+        nLayer = (len(par) + 1) // 3
+        return self._cachedResponse(self._coreFop(nLayer), par)
 
-        return fop.response(par)
+    def _createCoreFop(self, nLayer):
+        """Create the core forward operator for the current data basis."""
+        return pg.DC1dModellingC(nLayer, self.am, self.bm, self.an, self.bn)
 
     def drawModel(self, ax, model):
         nLay = (len(model)+1) // 3
@@ -195,33 +348,88 @@ class VESCModelling(VESModelling):
     def drawData(self, ax, data, err=None, label=None):
         """
         """
-        pa = data[len(data)//2::] * 1000. #mRad
-        paE = err
+        data = np.asarray(data)
+        n = len(data) // 2
+        ra, pa = data[:n], data[n:] * 1000. #mRad
 
+        raE, paE = None, None
         if err is not None:
             if isinstance(err, float):
-                err = np.ones(len(data))*err
+                raE, paE = err, err
+            else:
+                err = np.asarray(err)
+                raE, paE = err[:n], err[n:]
 
-            super(VESCModelling, self).drawData(ax, data[0:len(data)//2], err[0:len(data)//2],
-                             label=label)
-            paE = err[len(data)//2::]
-        else:
-            super(VESCModelling, self).drawData(ax, data[0:len(data)//2], label=label)
+        super(VESCModelling, self).drawData(ax, ra, raE, label=label)
 
         ax.loglog(pa, self.ab2, 'gx-')
 
         if err is not None:
-            ax.errorbar(pa, self.ab2,
-                        xerr=paE*pa, elinewidth=2, barsabove=True,
-                        linewidth=0, color='red')
+            self._drawErrorBars(ax, pa, paE)
 
         #ax.loglog(self.inv.response(), yVals, 'bo-')
-        ax.set_ylim(max(self.ab2), min(self.ab2))
+        ax.set_ylim(*self._ab2Lim)
         ax.set_xlabel('Apparent phase [mRad]')
         ax.set_ylabel('AB/2 in [m]')
         ax.grid(True)
 
 
+class VESStitchedModelling(VESModelling):
+    """VES forward operator for many soundings on one shared data basis.
+
+    All soundings share the electrode distances am, bm, an, bn and
+    therefore one core DC1d forward operator, including its Hankel filter
+    weights. The models of all soundings are stored as rows of one
+    contiguous matrix of shape (nSoundings, 2*nLayer-1).
+    """
+    def createStartModels(self, rhoa, nLayer):
+        """Create start models for all soundings.
+
+        Parameters
+        ----------
+        rhoa : array_like (nSoundings, nData)
+            Apparent resistivities, one sounding per row.
+
+        nLayer : int
+            Number of layers.
+
+        Returns
+        -------
+        models : np.array (nSoundings, 2*nLayer-1)
+            Thicknesses followed by resistivities for every sounding.
+        """
+        rhoa = np.atleast_2d(np.asarray(rhoa, dtype=np.float64))
+
+        models = np.empty((len(rhoa), 2 * nLayer - 1), dtype=np.float64)
+        models[:, :nLayer-1] = _startThicknesses(nLayer)
+        models[:, nLayer-1:] = np.median(rhoa, axis=1)[:, np.newaxis]
+        return models
+
+    def responseBatch(self, models):
+        """Forward response for all soundings.
+
+        Parameters
+        ----------
+        models : array_like (nSoundings, 2*nLayer-1)
+            Models of all soundings, one per row.
+
+        Returns
+        -------
+        responses : np.array (nSoundings, nData)
+        """
+        models = np.ascontiguousarray(np.atleast_2d(models), dtype=np.float64)
+
+        # use the shared core operator directly, many soundings would only
+        # flush the response cache and copy every row twice
+        fop = self._coreFop((models.shape[1] + 1) // 2)
+
+        resp = np.empty((len(models), len(self.am)), dtype=np.float64)
+        for i, par in enumerate(models):
+            resp[i] = fop.response(par)
+
+        return resp
+
+
 class VESManager(MethodManager1d):
     """Vertical electrical sounding (VES) manager class.
 
@@ -231,7 +439,7 @@ class VESManager(MethodManager1d):
     >>> import numpy as np
     >>> import pygimli as pg
     >>> from pygimli.physics import VESManager
-    >>> ab2 = np.logspace(np.log10(1.5), np.log10(100), 32)
+    >>> ab2 = np.geomspace(1.5, 100, 32)
     >>> mn2 = 1.0
     >>> # 3 layer with 100, 500 and 20 Ohmm
     >>> # and layer thickness of 4, 6, 10 m
@@ -290,37 +498,191 @@ class VESManager(MethodManager1d):
 
         return super(VESManager, self).simulate(model, **kwargs)
 
+    def simulateBatch(self, models, ab2=None, mn2=None, noiseLevel=0.0,
+                      nProc=None):
+        """Simulate measurement data for many models in parallel.
+
+        The core DC1d forward operator does not release the Python GIL and
+        keeps internal work arrays, so the models are distributed in chunks
+        over processes instead of threads.
+
+        Parameters
+        ----------
+        models : array_like (nModels, nPar)
+            Synthetic models, one per row.
+
+        ab2, mn2 : iterable [None]
+            Data basis. Take the current data basis if not given.
+
+        noiseLevel : float [0.0]
+            Relative gaussian noise added to all responses.
+
+        nProc : int [None]
+            Number of processes. None means the number of available cpus.
+
+        Returns
+        -------
+        ra : np.array (nModels, nData)
+            Simulated data, one row per model.
+
+        err : np.array (nModels, nData)
+            Relative errors, only returned for noiseLevel > 0.
+        """
+        from multiprocessing import Pool, cpu_count
+
+        if ab2 is not None and mn2 is not None:
+            self.fop.setDataBasis(ab2=ab2, mn2=mn2)
+
+        fop = self.fop
+        if fop.am is None:
+            raise Exception("I have no data basis .. "
+                            "don't know what to calculate.")
+
+        models = np.asarray(models, dtype=np.float64)
+        if models.size == 0:
+            ra = np.empty((0, len(fop.am)))
+        else:
+            models = np.atleast_2d(models)
+            nProc = min(nProc or cpu_count(), len(models))
+
+            # ship the full data basis, it need not be a Schlumberger one
+            args = [(chunk, fop.am, fop.bm, fop.an, fop.bn, self.complex)
+                    for chunk in np.array_split(models, nProc)]
+
+            if nProc > 1:
+                with Pool(nProc) as pool:
+                    ra = np.vstack(pool.map(_simulateChunk, args))
+            else:
+                ra = _simulateChunk(args[0])
+
+        if noiseLevel > 0:
+            err = np.array([self.estimateError(r, errLevel=noiseLevel)
+                            for r in ra]).reshape(ra.shape)
+            ra *= 1. + np.random.randn(*ra.shape) * err
+            return ra, err
+
+        return ra
+
     def invert(self, data=None, err=None, ab2=None, mn2=None, **kwargs):
         """Invert measured data.
         """
-        if 'nLayer' in kwargs:
-            self.fop.setLayers(kwargs['nLayer'])
-
         if ab2 is not None and mn2 is not None:
             self.fop.setDataBasis(ab2=ab2, mn2=mn2)
 
+        if 'nLayer' in kwargs and data is not None:
+            # the start model has to follow the current data, the layer mesh
+            # and regions are only rebuilt for another parametrization
+            self.fop.createStartModel(data, kwargs['nLayer'])
+
         #ensure data and error sizes here
 
         return super(VESManager, self).invert(dataVals=data, errVals=err,
                                               **kwargs)
 
+    def invertStitched(self, dataList, errList, ab2=None, mn2=None,
+                       nLayer=4, nProc=None, **kwargs):
+        """Invert independent soundings in parallel.
+
+        Every sounding is inverted by its own VESManager in a separate
+        process. The soundings share the same, arbitrary data basis. Region
+        properties set on this managers forward operator, e.g., limits
+        and transformations, are passed to all workers.
+
+        Parameters
+        ----------
+        dataList : iterable
+            Data values for each sounding.
+
+        errList : iterable | float
+            Error values for each sounding or one relative error for all.
+
+        ab2, mn2 : iterable [None]
+            Set a new Schlumberger data basis. Take the current data basis,
+            which may be arbitrary, if not given.
+
+        nLayer : int [4]
+            Number of layers.
+
+        nProc : int [None]
+            Number of processes. None means the number of available cpus.
+
+        Returns
+        -------
+        models : np.array(nSoundings, nModel)
+            Inversion results of all soundings.
+        """
+        from multiprocessing import Pool
+
+        if ab2 is not None and mn2 is not None:
+            self.fop.setDataBasis(ab2=ab2, mn2=mn2)
+
+        fop = self.fop
+        if fop.am is None:
+            raise Exception("I have no data basis .. "
+                            "don't know what to calculate.")
+
+        if isinstance(errList, float):
+            errList = [errList] * len(dataList)
+
+        if len(dataList) != len(errList):
+            raise Exception("Need one error for each sounding.")
+
+        kwargs.setdefault('showProgress', False)
+
+        regionProperties = self.fop.regionProperties()
+        args = [(data, err, fop.am, fop.bm, fop.an, fop.bn, nLayer,
+                 self.complex, regionProperties, kwargs)
+                for data, err in zip(dataList, errList)]
+
+        if nProc == 1:
+            models = [_invertSounding(a) for a in args]
+        else:
+            with Pool(nProc) as pool:
+                models = pool.map(_invertSounding, args)
+
+        return np.array(models)
+
+    def _dataBasis(self):
+        """Return ab2 and mn2 of the current data basis."""
+        if self.fop.am is None:
+            raise Exception("I have no data basis .. "
+                            "don't know what to calculate.")
+        return self.fop.ab2, 0.5 * np.abs(self.fop.am - self.fop.an)
+
     def loadData(self, fileName, **kwargs):
-        mat = np.loadtxt(fileName)
+        """Load data from ascii matrix or binary .npz file."""
+        if str(fileName).endswith('.npz'):
+            with np.load(fileName) as d:
+                ab2, mn2 = d['ab2'], d['mn2']
+                data, error = d['data'], d['error']
+            if len(data) == 2 * len(ab2):
+                self.complex = True
+            self.fop.setDataBasis(ab2=ab2, mn2=mn2)
+            return ab2, mn2, data, error
+
+        try:
+            import pandas as pd
+            mat = pd.read_csv(fileName, sep=r'\s+', comment='#',
+                              header=None, dtype=np.float64).to_numpy()
+        except ImportError:
+            mat = np.loadtxt(fileName)
+
         if len(mat[0]) == 4:
             self.fop.setDataBasis(ab2=mat[:,0], mn2=mat[:,1])
             return mat.T
         if len(mat[0]) == 6:
             self.complex = True
             self.fop.setDataBasis(ab2=mat[:,0], mn2=mat[:,1])
-            return mat[:,0], mat[:,1], np.array(pg.cat(mat[:,2], mat[:,4])), np.array(pg.cat(mat[:,3], mat[:,5]))
+            data = np.concatenate([mat[:,2], mat[:,4]])
+            error = np.concatenate([mat[:,3], mat[:,5]])
+            return mat[:,0], mat[:,1], data, error
 
     def exportData(self, fileName, data=None, error=None):
         """Export data into simple ascii matrix.
 
-        Usefull?
+        Export into a binary numpy archive if fileName ends with .npz.
         """
-        mn2 = np.abs((self.fop.am - self.fop.an) / 2.)
-        ab2 = (self.fop.am + self.fop.bm) / 2.
+        ab2, mn2 = self._dataBasis()
         mat = None
         if data is None:
             data = self.inv.dataVals
@@ -328,19 +690,51 @@ class VESManager(MethodManager1d):
         if error is None:
             error = self.inv.errorVals
 
+        if str(fileName).endswith('.npz'):
+            np.savez(fileName, ab2=ab2, mn2=mn2,
+                     data=np.asarray(data), error=np.asarray(error))
+            return
+
         if self.complex:
             nData = len(data)//2
-            mat = np.array([ab2, mn2,
-                            data[:nData], error[:nData],
-                            data[nData:], error[nData:]
-                            ]).T
-            np.savetxt(fileName, mat, header='ab/2\tmn/2\trhoa\terr\tphia\terrphi')
+            mat = np.column_stack([ab2, mn2,
+                                   data[:nData], error[:nData],
+                                   data[nData:], error[nData:]])
+            np.savetxt(fileName, mat, fmt='%.6g',
+                       header='ab/2\tmn/2\trhoa\terr\tphia\terrphi')
         else:
-            mat = np.array([ab2, mn2, data, error]).T
-            np.savetxt(fileName, mat, header='ab/2\tmn/2\trhoa\terr')
+            mat = np.column_stack([ab2, mn2, data, error])
+            np.savetxt(fileName, mat, fmt='%.6g',
+                       header='ab/2\tmn/2\trhoa\terr')
 
 
 
+def _invertSounding(args):
+    """Invert a single sounding, used by VESManager.invertStitched."""
+    (data, err, am, bm, an, bn, nLayer, isComplex,
+     regionProperties, kwargs) = args
+    mgr = VESManager(complex=isComplex, verbose=False)
+    # pool workers are daemonic and can't spawn the jacobian processes
+    mgr.fop.withMultiThread = False
+    for rID, props in regionProperties.items():
+        mgr.fop.setRegionProperties(rID, **props)
+    mgr.fop.setDataBasis(am=am, bm=bm, an=an, bn=bn)
+    model = mgr.invert(data, err, nLayer=nLayer, **kwargs)
+    return np.array(model)
+
+
+def _simulateChunk(args):
+    """Forward responses for a chunk of models, used by simulateBatch."""
+    models, am, bm, an, bn, isComplex = args
+    if isComplex:
+        fop = VESCModelling()
+    else:
+        fop = VESModelling()
+    fop.setDataBasis(am=am, bm=bm, an=an, bn=bn)
+
+    return np.array([np.array(fop.response(m)) for m in models])
+
+
 
 def test_VESManager(showProgress=False):
     """
@@ -356,13 +750,99 @@ def test_VESManager(showProgress=False):
     phi = [0., 20., 50., 0]
 
     synthModel = pg.cat(thicks, res)
-    ab2 = np.logspace(np.log10(1.5), np.log10(100.), 25)
+    ab2 = vesAB2(1.5, 100., 25)
 
     mgr = VESManager(verbose=True, debug=False)
     mgr.fop.setRegionProperties(0, limits=[0.5, 200], trans='log')
     ra, err = mgr.simulate(synthModel, ab2=ab2, mn2=1.0, noiseLevel=0.01)
     mgr.exportData('synth.ves', ra, err)
 
+    ### Test -- export/load round trips, also for pathlib.Path
+    import pathlib
+    for name in ['synth.ves', pathlib.Path('synth.ves'),
+                 'synth.npz', pathlib.Path('synth.npz')]:
+        mgr.exportData(name, ra, err)
+        ab2L, mn2L, raL, errL = VESManager().loadData(name)
+        np.testing.assert_allclose(ab2L, ab2, rtol=1e-5)
+        np.testing.assert_allclose(mn2L, 1.0, rtol=1e-5)
+        np.testing.assert_allclose(raL, ra, rtol=1e-5)
+        np.testing.assert_allclose(errL, err, rtol=1e-5)
+
+    ### Test -- a rejected data basis leaves the last valid one untouched
+    fop = VESModelling(ab2=ab2, mn2=1.0)
+    k = np.array(fop.k)
+    np.testing.assert_raises(Exception, fop.setDataBasis, ab2=ab2, mn2=0.0)
+    np.testing.assert_raises(Exception, fop.setDataBasis, ab2=ab2, mn2=ab2)
+    np.testing.assert_allclose(fop.k, k)
+    fop.setDataBasis(ab2=ab2, mn2=1.0)
+    np.testing.assert_allclose(fop.k, k)
+    np.testing.assert_allclose(fop.am, ab2 - 1.0)
+
+    ### Test -- in-place noise does not corrupt cached responses
+    raClean = np.array(mgr.simulate(synthModel))
+    mgr.simulate(synthModel, noiseLevel=0.1)
+    mgr.simulate(synthModel, noiseLevel=0.1)
+    np.testing.assert_allclose(mgr.simulate(synthModel), raClean)
+
+    ### Test -- a new data basis clears the response cache
+    assert len(mgr.fop._respCache) > 0
+    mgr.fop.setDataBasis(ab2=ab2, mn2=0.5)
+    assert len(mgr.fop._respCache) == 0
+    assert not np.allclose(mgr.simulate(synthModel), raClean)
+    mgr.fop.setDataBasis(ab2=ab2, mn2=1.0)
+    np.testing.assert_allclose(mgr.simulate(synthModel), raClean)
+
+    ### Test -- stitched forward operator on the shared data basis
+    sfop = VESStitchedModelling(ab2=ab2, mn2=1.0)
+    raArr = np.array(ra)
+    sm = sfop.createStartModels([raArr, raArr * 2.], nLayer=4)
+    assert sm.shape == (2, 7)
+    np.testing.assert_allclose(sm[:, :3], [[2., 4., 8.]] * 2)
+    np.testing.assert_allclose(sm[1, 3:], np.median(raArr) * 2.)
+    np.testing.assert_allclose(sfop.responseBatch([synthModel] * 2),
+                               [mgr.simulate(synthModel)] * 2)
+    assert len(sfop._respCache) == 0
+
+    ### Test -- stitched inversion equals single inversion
+    mgr3 = VESManager(verbose=False, debug=False)
+    mgr3.fop.setRegionProperties(0, limits=[0.5, 200], trans='log')
+    mgr3.fop.setDataBasis(ab2=ab2, mn2=1.0)
+    models = mgr3.invertStitched([ra, ra], [err, err], nLayer=4, lam=100,
+                                 nProc=2)
+    model = mgr3.invert(ra, err, nLayer=4, lam=100)
+    np.testing.assert_allclose(models[0], model, rtol=1e-6)
+    np.testing.assert_allclose(models[1], model, rtol=1e-6)
+
+    # arbitrary, non Schlumberger data basis
+    fop = mgr3.fop
+    am, bm, an, bn = fop.am, fop.bm, fop.an, fop.bn
+    mgr3.fop.setDataBasis(am=am, bm=bm * 2., an=an, bn=bn * 2.)
+    models = mgr3.invertStitched([ra], [err], nLayer=4, lam=100, nProc=2)
+    model = mgr3.invert(ra, err, nLayer=4, lam=100)
+    np.testing.assert_allclose(models[0], model, rtol=1e-6)
+
+    np.testing.assert_raises(Exception, VESManager().invertStitched,
+                             [ra], [err])
+
+    ### Test -- batch simulation equals single simulation
+    raBatch = mgr.simulateBatch([synthModel, synthModel], nProc=1)
+    np.testing.assert_allclose(raBatch[1], mgr.simulate(synthModel))
+    raBatch = mgr.simulateBatch([synthModel] * 3, nProc=2)
+    np.testing.assert_allclose(raBatch, [mgr.simulate(synthModel)] * 3)
+    assert mgr.simulateBatch([]).shape == (0, len(ab2))
+    raBatch, errBatch = mgr.simulateBatch([synthModel] * 2, nProc=1,
+                                          noiseLevel=0.01)
+    np.testing.assert_allclose(errBatch[0],
+                               mgr.estimateError(raBatch[0], errLevel=0.01))
+
+    # arbitrary, non Schlumberger data basis
+    fop = mgr.fop
+    am, bm, an, bn = fop.am, fop.bm, fop.an, fop.bn
+    mgr.fop.setDataBasis(am=am, bm=bm * 2., an=an, bn=bn * 2.)
+    np.testing.assert_allclose(mgr.simulateBatch([synthModel], nProc=2)[0],
+                               mgr.simulate(synthModel))
+    mgr.fop.setDataBasis(am=am, bm=bm, an=an, bn=bn)
+
     mgr.invert(ra, err, nLayer=4, lam=100,
                showProgress=showProgress)
 
@@ -370,11 +850,24 @@ def test_VESManager(showProgress=False):
     ### Test -- reinit with new parameter count
     mgr.invert(ra, err, nLayer=3,
                showProgress=showProgress)
+    assert len(mgr.inv.model) == 5
+
+    ### Test -- layers changed on the fop directly are not ignored
+    mgr.fop.setLayers(5)
+    mgr.invert(ra, err, nLayer=3,
+               showProgress=showProgress)
+    assert len(mgr.inv.model) == 5
+
+    ### Test -- same parametrization, new data gets a new start model
+    mgr.invert(ra * 2., err, nLayer=3,
+               showProgress=showProgress)
+    np.testing.assert_allclose(np.array(mgr.fop.startModel())[2:],
+                               np.median(ra * 2.))
 
     #np.testing.assert_array_less(mgr.inv.inv.chi2(), 1)
 
     ### Test -- reinit with new data basis
-    ab2 = np.logspace(np.log10(1.5), np.log10(50.), 10)
+    ab2 = vesAB2(1.5, 50., 10)
     ra, err = mgr.simulate(synthModel, ab2=ab2, mn2=1.0, noiseLevel=0.01)
 
     mgr2 = VESManager(verbose=False, debug=False)
@@ -424,295 +917,15 @@ def VESManagerApp():
     pg.wait()
 
 
+def __getattr__(name):
+    """Lazy access to the legacy VES manager."""
+    if name == '__VESManager':
+        from ._ves_legacy import __VESManager
+        return __VESManager
+    raise AttributeError("module {!r} has no attribute {!r}".format(
+        __name__, name))
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-class __VESManager():  # Should be derived from 1DManager
-    """Vertical electrical sounding (VES) manager class."""
-    def __init__(self,
-                 ab2,  # init with None?
-                 z,  # init with None?
-                 mn2=None,
-                 Type='smooth',
-                 verbose=False):
-        """
-        Parameters
-        ----------
-
-        ab2: array_like
-            Vector of distances between the point of the sounding and the
-            current electrodes.
-
-        mn2: array_like [ab2/3]
-            Vector of distances between the point of the sounding and the
-            potential electrodes.
-
-        z: array_like, case specific
-            smooth: z discretisation [m]\n
-            block: number of layers
-        """
-        self.verbose = verbose
-        self.type = Type  # better determined by type of z:
-        # self.type = 'block' if isinstance(z, int) else 'smooth'
-
-        self.ab2 = ab2
-
-        self.mn2 = mn2
-        if mn2 is None:
-            self.mn2 = ab2/3
-
-        self.Z = z  # z discretisation or nlay
-
-        self.FOP = None
-        self.INV = None
-        self.startmodel = None
-
-        self.createModelTrans()  # creates default as fallback
-
-    def createFOP(self):
-        """Creates the forward operator instance."""
-        if self.type == 'block':
-            self.FOP = pg.DC1dModelling(self.Z, self.ab2, self.mn2)
-            mesh1D = pg.createMesh1DBlock(self.Z)
-
-        if self.type == 'smooth':
-            self.FOP = pg.DC1dRhoModelling(self.Z, self.ab2, self.mn2)
-            mesh1D = pg.createMesh1D(nCells=len(self.Z) + 1)
-
-        self.FOP.setMesh(mesh1D)
-        self.applyModelTrans()
-
-    @staticmethod
-    def simulate(synmodel, ab2=None, mn2=None, errPerc=3.):
-        """Forward calculation with optional noise
-
-        Simulates a synthetic data set of a vertical electric sounding and
-        appends gaussian distributed noise.
-        Block only for now.
-
-        Parameters
-        ----------
-
-        ab2: array_like
-            Vector of distances between the point of the sounding and the
-            current electrodes.
-
-        mn2: array_like [ab2/3]
-            Vector of distances between the point of the sounding and the
-            potential electrodes.
-
-        errPerc: float [3.]
-            Percentage Value for the gaussian noise. Default are 3 %.
-
-        """
-        thk = synmodel[0]
-        res = synmodel[1]
-        if mn2 is None:
-            mn2 = ab2/3
-        FOP = pg.DC1dModelling(len(res), ab2, mn2)
-        syndata = FOP.response(thk + res)
-        syndata = syndata * (pg.randn(len(syndata)) * errPerc / 100. + 1.)
-        return syndata
-
-    def createINV(self, data, relErrorP=3., startmodel=None, **kwargs):
-        """Create inversion instance
-
-        Parameters
-        ----------
-
-        data : array_like
-            Data array you would like to fit with this inverse modelling
-            approach.
-
-        relErrorP : float [3.]
-            Percentage value of the relative error you assume. Default 3. means
-            a 3 % error is assumed. Affects the chi2 criteria during the
-            inversion process and therefore the inversion result (Inversion
-            tries to fit the given data within the given errors).
-
-        startmodel : array_like [None]
-            Optional possibility to define the starting model for the inversion
-            routine. The default will be the mean of the given data.
-
-        **kwargs : keyword arguments
-        ----------------------------
-
-        Keyword arguments are redirected to the block inversion instance only!
-
-        lambdaFactor: float < 1.0 [0.8]
-            Inversion in Marquardt scheme reduces the lambda from initial high
-            values down to a certain minimum. The reduction per step is
-            represented by this value. Default is a reduction to 80% of the
-            previous step (By the way, the default start lambda is 1000).
-
-        robust: boolean [False]
-            Recalculation of the errors to reduce the weight of spikes in the
-            data. Not necessary for synthetic or "good" field data.
-        """
-        if self.FOP is None:
-            self.createFOP()
-
-        self.INV = pg.RInversion(data,
-                                 self.FOP,
-                                 False)
-
-        self.applyDataTrans()
-
-        if self.type == 'block':
-            # print(kwargs.pop('lambdaFactor'))  # cannot be popped twice!!!
-            print(kwargs.get('lambdaFactor'))
-            self.INV.setMarquardtScheme(kwargs.pop('lambdaFactor', 0.8))
-            self.INV.setRobustData(kwargs.pop('robust', False))
-
-        if self.type == 'smooth':
-            pass
-
-        self.INV.setRelativeError(relErrorP / 100.0)
-
-        if startmodel is not None:
-            self.startmodel = startmodel
-
-        if self.startmodel is None:
-            self.createStartModel(data)
-
-        if self.type == 'smooth':
-            self.INV.setModel(self.startmodel)
-
-        else:
-            self.FOP.region(0).setStartValue(self.startmodel[0])
-            self.FOP.region(1).setStartValue(self.startmodel[1])
-
-    def createModelTrans(self,
-                         thkBounds=(10., 0.1, 30.),
-                         modelBounds=(10, 1.0, 10000.),
-                         trans=('log', 'log')):
-        """Define model transformations for inversion."""
-        self.thkBounds = thkBounds  # thk(start, min, max)
-        self.rhoBounds = modelBounds  # rho (model) (start, min, max)
-        self.trans = trans
-        if self.FOP is not None:
-            self.applyModelTrans()
-
-    def applyModelTrans(self):
-        """Pass previously given bounds for the model transformation to FOP."""
-        if self.FOP is None:
-            raise Exception('initialize forward operator before appending \
-                             proper boundaries for the model transformation')
-
-        if self.type == 'smooth':
-            self.FOP.region(0).setParameters(self.rhoBounds[0],
-                                             self.rhoBounds[1],
-                                             self.rhoBounds[2], self.trans[1])
-        elif self.type == 'block':
-
-            self.FOP.region(0).setParameters(self.thkBounds[0],
-                                             self.thkBounds[1],
-                                             self.thkBounds[2], self.trans[0])
-
-            self.FOP.region(1).setParameters(self.rhoBounds[0],
-                                             self.rhoBounds[1],
-                                             self.rhoBounds[2], self.trans[1])
-
-    def applyDataTrans(self):
-        """Apply a logarithmic transformation to the data."""
-        self.dataTrans = pg.RTransLog()
-        self.INV.setTransData(self.dataTrans)
-
-    def createStartModel(self, data):
-        """Creates a default start model for the inversion."""
-        if self.type == 'smooth':
-            self.startmodel = pg.RVector(len(self.Z) + 1, np.median(data))
-        else:
-            self.startmodel = [self.getDepth() / self.Z / 2, np.median(data)]
-
-    def invert(self, data, startmodel=None, relErrorP=3., lam=None, **kwargs):
-        """Run inversion
-
-        Creates forward operator, initializes inversion scheme and run
-        inversion based on the input parameters. kwargs are redirected to
-        the createINV method.
-        """
-        self.dataToFit = data
-        if self.INV is None:
-            self.createINV(data,
-                           relErrorP=relErrorP,
-                           startmodel=startmodel,
-                           **kwargs)
-
-        if self.type == 'smooth' and lam is None:
-            self.resDistribution = self.INV.runChi1()
-
-        else:
-            if lam is None:
-                lam = 1000.0
-            self.INV.setLambda(lam)
-            self.resDistribution = self.INV.run()
-
-        if self.verbose is False:
-            self.INV.echoStatus()
-        return self.resDistribution
-
-    def splitBlockModel(self):
-        """Returns the thickness and ressitivities of the model."""
-        z = int(self.Z) - 1
-        return self.resDistribution[:z], self.resDistribution[z:]
-
-    def getDepth(self):
-        """Rule-of-thumb for Wenner/Schlumberger."""
-        return np.max(self.ab2) / 3.  # rule-of-thumb for Wenner/Schlumberger
-
-    def showResults(self, ax=None, syn=None, color=None):
-        """Shows the Results of the inversion."""
-        if ax is None:
-            fig, ax = plt.subplots(ncols=1, figsize=(8, 6))
-        if syn is not None:
-            drawModel1D(ax, syn[0], syn[1], color='b', label='synthetic',
-                        plotfunction='semilogx')
-        if color is None:
-            color = 'g'
-        if self.type == 'smooth':
-            drawModel1D(ax, self.Z, self.resDistribution, color=color,
-                        label=r'$\lambda$={:2.2f}'
-                        .format(self.INV.getLambda()))
-        else:
-            thk, rho = self.splitBlockModel()
-            drawModel1D(ax, thk, rho, color=color,
-                        label=r'$\ chi^2$={:2.2f}'
-                        .format(self.INV.getChi2()))
-        ax.grid(True, which='both')
-        ax.legend(loc='best')
-        return ax
-
-    def showFit(self, ax=None, color='g', marker='-', syn=True):
-        """Visualizes the data fit."""
-        if syn is True:
-            ax.loglog(self.dataToFit, self.ab2, 'bx-',
-                      label='measured/synthetic')
-        ax.loglog(self.INV.response(), self.ab2, color, label='fitted')
-        ax.set_ylim((max(self.ab2), min(self.ab2)))
-        ax.grid(True, which='both')
-        ax.set_xlabel(r'$\rho_a$ [$\Omega$m]')
-        ax.set_ylabel('AB/2 [m]')
-        ax.legend(loc='best')
-        return ax
-
-    def showResultsAndFit(self, syn=None):
-        """Calls showResults and showFit."""
-        fig, ax = plt.subplots(ncols=2, figsize=(8, 6))
-        self.showResults(ax=ax[0], syn=syn)
-        self.showFit(ax=ax[1])
-
 if __name__ == '__main__':
     VESManagerApp()
 
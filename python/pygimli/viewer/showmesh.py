@@ -291,31 +291,39 @@ def showMesh(mesh, data=None, hold=False, block=False, colorBar=None,
             else:
                 pg.warn("No valid stream data:", data.shape, data.ndim)
                 showMesh = True
-        elif min(data) == max(data):  # or pg.haveInfNaN(data):
-            pg.warn("No valid data: ", min(data), max(data), pg.haveInfNaN(data))
-            showMesh = True
         else:
-            validData = True
-            try:
-                cMap = kwargs.pop('cMap', None)
+            # one pass in numpy instead of two python min/max traversals
+            if not isinstance(data, np.ma.core.MaskedArray):
+                data = np.asarray(data)
+
+            dataMin, dataMax = data.min(), data.max()
+
+            if dataMin == dataMax:  # or pg.haveInfNaN(data):
+                pg.warn("No valid data: ", dataMin, dataMax,
+                        pg.haveInfNaN(data))
+                showMesh = True
+            else:
+                validData = True
+                try:
+                    cMap = kwargs.pop('cMap', None)
                 
-                if len(data) == mesh.cellCount():
-                    gci = drawModel(ax, mesh, data, **kwargs)
-                    if showBoundary is None:
-                        showBoundary = True
-
-                elif len(data) == mesh.nodeCount():
-                    gci = drawField(ax, mesh, data, **kwargs)
-
-                if cMap is not None:
-                    gci.set_cmap(cmapFromName(cMap))
-                    #gci.cmap.set_under('k')
-
-            except BaseException as e:
-                print("Exception occured: ", e)
-                print("Data: ", min(data), max(data), pg.haveInfNaN(data))
-                print("Mesh: ", mesh)
-                drawMesh(ax, mesh, **kwargs)
+                    if len(data) == mesh.cellCount():
+                        gci = drawModel(ax, mesh, data, **kwargs)
+                        if showBoundary is None:
+                            showBoundary = True
+
+                    elif len(data) == mesh.nodeCount():
+                        gci = drawField(ax, mesh, data, **kwargs)
+
+                    if cMap is not None:
+                        gci.set_cmap(cmapFromName(cMap))
+                        #gci.cmap.set_under('k')
+
+                except BaseException as e:
+                    print("Exception occured: ", e)
+                    print("Data: ", dataMin, dataMax, pg.haveInfNaN(data))
+                    print("Mesh: ", mesh)
+                    drawMesh(ax, mesh, **kwargs)
 
     if mesh.cellCount() == 0:
         showMesh = False